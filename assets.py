@@ -0,0 +1,85 @@
+import os
+import struct
+
+import pygame
+
+# Pasta de imagens resolvida a partir deste arquivo (independe do diretório atual)
+ASSETS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets")
+
+BACKGROUND = "img_46.png"
+GAME_OVER = "img_45.png"
+FLOOR = "img_50.png"
+PIPE = "greenpipe.png"
+BIRD_FRAMES = ["img_47.png", "img_48.png", "img_49.png"]
+
+
+class AssetManager:
+    """Carrega imagens sob demanda e guarda em cache as superfícies derivadas.
+
+    Nada é decodificado até o primeiro uso: `size` lê apenas o cabeçalho do PNG,
+    então o modo headless consegue as dimensões sem carregar nenhuma imagem.
+    Versões espelhadas, rotacionadas e suas máscaras são geradas uma única vez.
+    """
+
+    def __init__(self, directory=ASSETS_DIR):
+        self.directory = directory
+        self._sizes = {}
+        self._surfaces = {}
+        self._masks = {}
+
+    def path(self, name):
+        return os.path.join(self.directory, name)
+
+    def missing(self, names):
+        return [name for name in names if not os.path.isfile(self.path(name))]
+
+    def size(self, name):
+        if name not in self._sizes:
+            with open(self.path(name), "rb") as f:
+                header = f.read(24)
+            if header[:8] != b"\x89PNG\r\n\x1a\n":
+                # Formato desconhecido: decodifica para descobrir o tamanho
+                self._sizes[name] = self.image(name).get_size()
+            else:
+                # IHDR: largura e altura logo após a assinatura
+                self._sizes[name] = struct.unpack(">II", header[16:24])
+        return self._sizes[name]
+
+    def image(self, name):
+        key = (name, False, False, 0)
+        surface = self._surfaces.get(key)
+        if surface is None:
+            surface = pygame.image.load(self.path(name))
+            # convert_alpha() só funciona depois de criar a janela
+            if pygame.display.get_init() and pygame.display.get_surface() is not None:
+                surface = surface.convert_alpha()
+            self._surfaces[key] = surface
+        return surface
+
+    def surface(self, name, flip_x=False, flip_y=False, angle=0):
+        angle = int(round(angle)) % 360
+        key = (name, flip_x, flip_y, angle)
+        surface = self._surfaces.get(key)
+        if surface is None:
+            if angle:
+                surface = pygame.transform.rotate(self.surface(name, flip_x, flip_y), angle)
+            else:
+                surface = pygame.transform.flip(self.image(name), flip_x, flip_y)
+            self._surfaces[key] = surface
+        return surface
+
+    def mask(self, name, flip_x=False, flip_y=False, angle=0):
+        key = (name, flip_x, flip_y, int(round(angle)) % 360)
+        mask = self._masks.get(key)
+        if mask is None:
+            mask = pygame.mask.from_surface(self.surface(name, flip_x, flip_y, angle))
+            self._masks[key] = mask
+        return mask
+
+    def clear(self):
+        self._surfaces.clear()
+        self._masks.clear()
+
+
+# Instância compartilhada por flappy, flappy_ai e play_winner
+assets = AssetManager()
@@ -0,0 +1,6 @@
+# Constantes compartilhadas entre o treino (flappy_ai), o simulador em lote
+# (vector_env) e as ferramentas do vencedor (play_winner, policy_table).
+# Este módulo não pode ter efeitos colaterais (nada de pygame aqui).
+
+# Saída da rede acima deste valor = pular
+JUMP_THRESHOLD = 0.3
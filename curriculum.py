@@ -0,0 +1,93 @@
+import copy
+from collections import namedtuple
+
+import neat
+
+# gap: abertura entre os canos, vel: velocidade dos canos/chão,
+# spawn_x: posição onde cada novo cano nasce (espaçamento entre canos)
+Difficulty = namedtuple("Difficulty", ["gap", "vel", "spawn_x"])
+
+# Do mais fácil ao mais difícil; o nível 3 é a configuração original do jogo
+LEVELS = [
+    Difficulty(gap=320, vel=5, spawn_x=250),
+    Difficulty(gap=280, vel=5, spawn_x=400),
+    Difficulty(gap=240, vel=5, spawn_x=550),
+    Difficulty(gap=200, vel=5, spawn_x=700),
+    Difficulty(gap=180, vel=6, spawn_x=700),
+    Difficulty(gap=160, vel=7, spawn_x=700),
+]
+ORIGINAL_LEVEL = 3
+
+
+class CurriculumSolved(Exception):
+    """Levantada quando a população atinge o fitness_threshold no nível alvo."""
+
+    def __init__(self, winner):
+        super().__init__(winner)
+        self.winner = winner
+
+
+class CurriculumScheduler(neat.reporting.BaseReporter):
+    """Ajusta a dificuldade a cada geração conforme a taxa de passagem da anterior.
+
+    A taxa de passagem é a fração da população que passou pelo primeiro cano.
+    Acima de `promote_rate` o nível sobe; abaixo de `demote_rate` por `patience`
+    gerações seguidas, o nível desce. Assim as primeiras gerações não gastam o
+    orçamento de frames morrendo no primeiro cano e as últimas não saturam
+    `max_frames` num nível fácil demais.
+
+    Com o curriculum o Population deve rodar com `no_fitness_termination`: o
+    fitness_threshold só encerra o treino (CurriculumSolved) a partir de
+    `target_level`, senão um único cano passado no nível 0 já bastaria. `best`
+    guarda uma cópia do melhor genoma avaliado a partir de `target_level`
+    (None se esse nível nunca foi alcançado).
+    """
+
+    def __init__(self, levels=LEVELS, start_level=0, promote_rate=0.1,
+                 demote_rate=0.02, patience=3, target_level=ORIGINAL_LEVEL):
+        self.levels = list(levels)
+        self.level = start_level
+        self.target_level = target_level
+        self.best = None
+        self.promote_rate = promote_rate
+        self.demote_rate = demote_rate
+        self.patience = patience
+        self.pass_rate = 0.0
+        self._stuck = 0
+
+    @property
+    def current(self):
+        return self.levels[self.level]
+
+    def record_episode(self, passed=0, population=0, **_):
+        # Chamado por eval_genomes ao fim da simulação de cada geração
+        self.pass_rate = passed / population if population else 0.0
+
+    def post_evaluate(self, config, population, species, best_genome):
+        # Chamado com o nível em que a geração acabou de ser avaliada
+        if self.level < self.target_level:
+            return
+        if self.best is None or best_genome.fitness > self.best.fitness:
+            # Cópia: os elites são o mesmo objeto na geração seguinte e o eval_genomes
+            # sobrescreve o fitness deles (talvez num nível mais fácil)
+            self.best = copy.deepcopy(best_genome)
+        if best_genome.fitness >= config.fitness_threshold:
+            raise CurriculumSolved(best_genome)
+
+    def end_generation(self, config, population, species_set):
+        previous = self.level
+        if self.pass_rate >= self.promote_rate and self.level < len(self.levels) - 1:
+            self.level += 1
+            self._stuck = 0
+        elif self.pass_rate <= self.demote_rate and self.level > 0:
+            self._stuck += 1
+            if self._stuck >= self.patience:
+                self.level -= 1
+                self._stuck = 0
+        else:
+            self._stuck = 0
+
+        d = self.current
+        change = "" if self.level == previous else " ({} -> {})".format(previous, self.level)
+        print("Curriculum: pass rate {0:.1%}, nível {1}{2}: gap={3.gap}, vel={3.vel}, spawn_x={3.spawn_x}".format(
+            self.pass_rate, self.level, change, d))
@@ -0,0 +1,100 @@
+from collections import namedtuple, OrderedDict
+from configparser import ConfigParser
+
+import numpy as np
+
+# Estado de um frame para os pássaros vivos (arrays) e o cano atual (escalares)
+FrameState = namedtuple("FrameState", ["bird_x", "bird_y", "pipe_x", "gap_center"])
+
+# Termos registrados: nome -> função(state) -> array com um valor por pássaro
+TERMS = {}
+# Termos de evento (ex.: passar um cano): valem 1 por ocorrência
+EVENTS = set()
+
+# Pesos originais do eval_genomes, usados se o config não tiver [FitnessShaping]
+DEFAULT_WEIGHTS = OrderedDict([
+    ("alive", 0.1),
+    ("approach", 1.0),
+    ("centering", 1.0),
+    ("pipe_passed", 5000.0),
+])
+
+
+def term(name, event=False):
+    def register(func):
+        TERMS[name] = func
+        if event:
+            EVENTS.add(name)
+        return func
+    return register
+
+
+@term("alive")
+def alive(state):
+    # Por estar vivo
+    return np.ones_like(state.bird_y)
+
+
+@term("approach")
+def approach(state):
+    # Por se aproximar horizontalmente do cano (antes de passar)
+    distance_to_pipe = state.pipe_x - state.bird_x
+    return np.where(distance_to_pipe > 0, np.maximum(0, (500 - distance_to_pipe) / 100), 0.0)
+
+
+@term("centering")
+def centering(state):
+    # Por estar perto do centro do gap
+    vertical_distance_to_center = np.abs(state.bird_y - state.gap_center)
+    return np.where(vertical_distance_to_center < 100, (100 - vertical_distance_to_center) / 20, 0.0)
+
+
+@term("pipe_passed", event=True)
+def pipe_passed(state):
+    return np.ones_like(state.bird_y)
+
+
+class FitnessPipeline:
+    """Soma os termos de fitness selecionados, ponderados, sobre a população inteira.
+
+    `step` roda uma vez por frame e atualiza o array de fitness de todos os
+    pássaros vivos de uma vez; `award` aplica termos de evento a pássaros
+    específicos. A contribuição de cada termo é acumulada em `totals`.
+    """
+
+    def __init__(self, weights=DEFAULT_WEIGHTS):
+        unknown = [name for name in weights if name not in TERMS]
+        if unknown:
+            raise ValueError("Termos de fitness desconhecidos: {}".format(", ".join(unknown)))
+        self.weights = OrderedDict(weights)
+        self._frame_terms = [(name, TERMS[name], w) for name, w in self.weights.items()
+                             if name not in EVENTS and w != 0]
+        self.totals = OrderedDict((name, 0.0) for name in self.weights)
+
+    @classmethod
+    def from_config(cls, config_path, section="FitnessShaping"):
+        parameters = ConfigParser()
+        parameters.read(config_path)
+        if not parameters.has_section(section):
+            return cls()
+        return cls(OrderedDict((name, float(value)) for name, value in parameters.items(section)))
+
+    def reset(self):
+        for name in self.totals:
+            self.totals[name] = 0.0
+
+    def step(self, fitness, idx, state):
+        # fitness: array da população; idx: índices dos pássaros vivos
+        for name, func, weight in self._frame_terms:
+            contribution = weight * func(state)
+            fitness[idx] += contribution
+            self.totals[name] += float(contribution.sum())
+
+    def award(self, name, fitness, idx):
+        weight = self.weights.get(name, 0.0)
+        if weight:
+            fitness[idx] += weight
+            self.totals[name] += weight * np.size(idx)
+
+    def report(self):
+        return ", ".join("{}={:.1f}".format(name, total) for name, total in self.totals.items())
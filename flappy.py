@@ -1,12 +1,22 @@
 # Importing the libraries
 import pygame
 import sys
-import time
 import random
+from assets import assets, BACKGROUND, GAME_OVER, FLOOR, PIPE, BIRD_FRAMES
 
 # Initializing the pygame
 pygame.init()
 
+# Physics runs at a fixed rate, independent of how fast frames are drawn
+TICK_RATE = 120
+TICK_MS = 1000 / TICK_RATE
+MAX_TICKS_PER_FRAME = 8  # catch up at most this much after a slow frame
+MAX_FPS = 120
+
+# Timers in physics ticks (same periods as the old 200 ms / 1200 ms USEREVENTs)
+FLAP_TICKS = TICK_RATE * 200 // 1000
+PIPE_TICKS = TICK_RATE * 1200 // 1000
+
 # Frames per second
 clock = pygame.time.Clock()
 
@@ -15,6 +25,7 @@ clock = pygame.time.Clock()
 def draw_floor():
     screen.blit(floor_img, (floor_x, 520))
     screen.blit(floor_img, (floor_x + 448, 520))
+    return pygame.Rect(0, 520, width, height - 520)
 
 
 # Function to create pipes
@@ -25,38 +36,53 @@ def create_pipes():
     return top_pipe, bottom_pipe
 
 
-# Function for animation
-def pipe_animation():
-    global game_over, score_time
+# Function to move the pipes one tick
+def move_pipes():
+    global pipes, game_over
+    for pipe in pipes:
+        pipe.centerx -= 3
+        if bird_rect.colliderect(pipe):
+            game_over = True
+    pipes = [pipe for pipe in pipes if pipe.right >= 0]
+
+
+# Function to draw the pipes (the flipped sprite is cached by the asset manager)
+def draw_pipes():
+    flipped_pipe = assets.surface(PIPE, flip_y=True)
+    rects = []
     for pipe in pipes:
         if pipe.top < 0:
-            flipped_pipe = pygame.transform.flip(pipe_img, False, True)
-            screen.blit(flipped_pipe, pipe)
+            rects.append(screen.blit(flipped_pipe, pipe))
         else:
-            screen.blit(pipe_img, pipe)
+            rects.append(screen.blit(pipe_img, pipe))
+    return rects
 
-        pipe.centerx -= 3
-        if pipe.right < 0:
-            pipes.remove(pipe)
 
-        if bird_rect.colliderect(pipe):
-            game_over = True
+# Function to render text only when it changes
+def render_text(text):
+    surface = text_cache.get(text)
+    if surface is None:
+        surface = score_font.render(text, True, (255, 255, 255))
+        text_cache[text] = surface
+    return surface
 
 
 # Function to draw score
 def draw_score(game_state):
+    rects = []
     if game_state == "game_on":
-        score_text = score_font.render(str(score), True, (255, 255, 255))
+        score_text = render_text(str(score))
         score_rect = score_text.get_rect(center=(width // 2, 66))
-        screen.blit(score_text, score_rect)
+        rects.append(screen.blit(score_text, score_rect))
     elif game_state == "game_over":
-        score_text = score_font.render(f" Score: {score}", True, (255, 255, 255))
+        score_text = render_text(f" Score: {score}")
         score_rect = score_text.get_rect(center=(width // 2, 66))
-        screen.blit(score_text, score_rect)
+        rects.append(screen.blit(score_text, score_rect))
 
-        high_score_text = score_font.render(f"High Score: {high_score}", True, (255, 255, 255))
+        high_score_text = render_text(f"High Score: {high_score}")
         high_score_rect = high_score_text.get_rect(center=(width // 2, 506))
-        screen.blit(high_score_text, high_score_rect)
+        rects.append(screen.blit(high_score_text, high_score_rect))
+    return rects
 
 
 # Function to update the score
@@ -74,42 +100,105 @@ def score_update():
         high_score = score
 
 
+# Function to advance the game by one fixed physics tick
+def update():
+    global tick, bird_index, bird_img, bird_rect, bird_movement, game_over, floor_x, flap_pressed
+    tick += 1
+
+    # To load different stages
+    if tick % FLAP_TICKS == 0:
+        bird_index += 1
+
+        if bird_index > 2:
+            bird_index = 0
+
+        bird_img = birds[bird_index]
+        bird_rect = bird_up.get_rect(center=bird_rect.center)
+
+    # To add pipes in the list
+    if tick % PIPE_TICKS == 0:
+        pipes.extend(create_pipes())
+
+    if not game_over:
+        if flap_pressed:
+            bird_movement = -7
+        bird_movement += gravity
+        bird_rect.centery += bird_movement
+
+        if bird_rect.top < 5 or bird_rect.bottom >= 550:
+            game_over = True
+
+        move_pipes()
+        score_update()
+    flap_pressed = False
+
+    # To move the base
+    floor_x -= 1
+    if floor_x < -448:
+        floor_x = 0
+
+
+# Function to draw the frame, restoring the background only where needed
+def draw():
+    global dirty_rects, full_redraw
+    if full_redraw:
+        screen.blit(back_img, (0, 0))
+    else:
+        for rect in dirty_rects:
+            screen.blit(back_img, rect, rect)
+
+    rects = []
+    if not game_over:
+        rotated_bird = assets.surface(BIRD_FRAMES[bird_index], angle=bird_movement * -6)
+        rects.append(screen.blit(rotated_bird, bird_rect))
+        rects.extend(draw_pipes())
+        rects.extend(draw_score("game_on"))
+    else:
+        rects.append(screen.blit(over_img, over_rect))
+        rects.extend(draw_score("game_over"))
+    rects.append(draw_floor())
+
+    # Update the game window: last frame's rects (now erased) plus this frame's
+    if full_redraw:
+        pygame.display.update()
+        full_redraw = False
+    else:
+        pygame.display.update(dirty_rects + rects)
+    dirty_rects = rects
+
+
 # Game window
 width, height = 350, 622
-clock = pygame.time.Clock()
 screen = pygame.display.set_mode((width, height))
 pygame.display.set_caption("Flappy Bird")
 
 # setting background and base image
-back_img = pygame.image.load("img_46.png")
-floor_img = pygame.image.load("img_50.png")
+back_img = assets.image(BACKGROUND)
+floor_img = assets.image(FLOOR)
 floor_x = 0
 
 # different stages of bird
-bird_up = pygame.image.load("img_47.png")
-bird_down = pygame.image.load("img_48.png")
-bird_mid = pygame.image.load("img_49.png")
+bird_up = assets.image(BIRD_FRAMES[0])
+bird_down = assets.image(BIRD_FRAMES[1])
+bird_mid = assets.image(BIRD_FRAMES[2])
 birds = [bird_up, bird_mid, bird_down]
 bird_index = 0
-bird_flap = pygame.USEREVENT
-pygame.time.set_timer(bird_flap, 200)
 bird_img = birds[bird_index]
 bird_rect = bird_img.get_rect(center=(67, 622 // 2))
 bird_movement = 0
 gravity = 3
+flap_pressed = False
 
 # Loading pipe image
-pipe_img = pygame.image.load("greenpipe.png")
+pipe_img = assets.image(PIPE)
 pipe_height = [400, 350, 533, 490]
 
 # for the pipes to appear
 pipes = []
-create_pipe = pygame.USEREVENT + 1
-pygame.time.set_timer(create_pipe, 1200)
 
 # Displaying game over image
 game_over = False
-over_img = pygame.image.load("img_45.png").convert_alpha ()
+over_img = assets.image(GAME_OVER)
 over_rect = over_img.get_rect(center=(width // 2, height // 2))
 
 # setting variables and font for score
@@ -117,11 +206,19 @@ score = 0
 high_score = 0
 score_time = True
 score_font = pygame.font.Font("freesansbold.ttf", 27)
+text_cache = {}
+
+# Fixed-timestep state
+tick = 0
+accumulator = 0.0
+dirty_rects = []
+full_redraw = True
 
 # Game loop
 running = True
 while running:
-    clock.tick(120)
+    accumulator += clock.tick(MAX_FPS)
+    accumulator = min(accumulator, MAX_TICKS_PER_FRAME * TICK_MS)
 
     # for checking the events
     for event in pygame.event.get():
@@ -131,60 +228,26 @@ while running:
 
         if event.type == pygame.KEYDOWN:  # Key pressed event
             if event.key == pygame.K_SPACE and not game_over:  # If space key is pressed
-                bird_movement = 0
-                bird_movement = -7
+                flap_pressed = True  # applied on the next physics tick
 
-            if event.key == pygame.K_SPACE and game_over:
+            elif event.key == pygame.K_SPACE and game_over:
                 game_over = False
                 pipes = []
                 bird_movement = 0
                 bird_rect = bird_img.get_rect(center=(67, 622 // 2))
                 score_time = True
                 score = 0
+                full_redraw = True
 
-        # To load different stages
-        if event.type == bird_flap:
-            bird_index += 1
-
-            if bird_index > 2:
-                bird_index = 0
-
-            bird_img = birds[bird_index]
-            bird_rect = bird_up.get_rect(center=bird_rect.center)
-
-        # To add pipes in the list
-        if event.type == create_pipe:
-            pipes.extend(create_pipes())
-
-    screen.blit(floor_img, (floor_x, 550))
-    screen.blit(back_img, (0, 0))
-
-    # Game over conditions
-    if not game_over:
-        bird_movement += gravity
-        bird_rect.centery += bird_movement
-        rotated_bird = pygame.transform.rotozoom(bird_img, bird_movement * -6, 1)
-
-        if bird_rect.top < 5 or bird_rect.bottom >= 550:
-            game_over = True
-
-        screen.blit(rotated_bird, bird_rect)
-        pipe_animation()
-        score_update()
-        draw_score("game_on")
-    elif game_over:
-        screen.blit(over_img, over_rect)
-        draw_score("game_over")
-
-    # To move the base
-    floor_x -= 1
-    if floor_x < -448:
-        floor_x = 0
-
-    draw_floor()
+    # Physics: as many fixed ticks as the elapsed time covers
+    was_over = game_over
+    while accumulator >= TICK_MS:
+        update()
+        accumulator -= TICK_MS
+    if game_over != was_over:
+        full_redraw = True
 
-    # Update the game window
-    pygame.display.update()
+    draw()
 
 # quiting the pygame and sys
 pygame.quit()
@@ -5,14 +5,36 @@ import random
 import os
 import neat
 import pickle
+import numpy as np
 import visualize
+from constants import JUMP_THRESHOLD
+from assets import assets, BACKGROUND, FLOOR, PIPE, BIRD_FRAMES
+from metrics import StreamingMetricsReporter
+from curriculum import CurriculumScheduler, CurriculumSolved, Difficulty
+from fitness import FitnessPipeline, FrameState
+from speciation import NumpySpeciesSet
 
 # ### CONFIGURAÇÃO: Defina como True para executar sem gráficos (máxima velocidade)
 HEADLESS_MODE = True  # Mude para False se quiser ver os gráficos
 
+# ### CONFIGURAÇÃO: Limiar da saída da rede para pular: JUMP_THRESHOLD em constants.py
+# (o mesmo valor é usado por play_winner, policy_table e vector_env)
+
+# ### CONFIGURAÇÃO: Dificuldade (gap, velocidade, espaçamento) ajustada a cada geração
+CURRICULUM_MODE = False
+
 # ### NEAT: Variável para contar as gerações
 gen = 0
 
+# ### NEAT: Reporters que recebem o resumo de cada geração (score, frames simulados)
+episode_reporters = []
+
+# ### NEAT: Escalonador de dificuldade (apenas com CURRICULUM_MODE)
+curriculum = None
+
+# ### NEAT: Termos de fitness (lidos da seção [FitnessShaping] do config em run())
+fitness_pipeline = FitnessPipeline()
+
 # --- Constantes do Jogo ---
 WIDTH, HEIGHT = 350, 622
 FLOOR_Y = 550
@@ -24,35 +46,19 @@ if not HEADLESS_MODE:
     screen = pygame.display.set_mode((WIDTH, HEIGHT))
     pygame.display.set_caption("Flappy Bird AI")
 else:
-    # Modo headless: definir um modo de display mínimo para permitir convert_alpha()
+    # Modo headless: nenhuma imagem é decodificada, então não precisa de janela
     os.environ['SDL_VIDEODRIVER'] = 'dummy'
-    screen = pygame.display.set_mode((1, 1))
+    screen = None
 
 # Flag para controlar se deve mostrar gráficos (apenas para as melhores gerações)
 SHOW_GRAPHICS = False
 
-# --- Carregando Imagens ---
-def load_image(file_name):
-    img = pygame.image.load(os.path.join("assets", file_name))
-    return img.convert_alpha() if not HEADLESS_MODE else img.convert()
-
-try:
-    if not HEADLESS_MODE:
-        back_img = load_image("img_46.png")
-        over_img = load_image("img_45.png")
-    else:
-        back_img = None
-        over_img = None
-    
-    floor_img = load_image("img_50.png")
-    pipe_img = load_image("greenpipe.png")
-    
-    bird_down = load_image("img_47.png")
-    bird_mid = load_image("img_48.png")
-    bird_up = load_image("img_49.png")
-    BIRDS_IMGS = [bird_down, bird_mid, bird_up]
-except pygame.error as e:
-    print(f"Erro ao carregar imagem: {e}")
+# --- Imagens ---
+# As imagens são carregadas sob demanda pelo AssetManager (só quando desenhadas);
+# aqui apenas conferimos se os arquivos existem.
+missing_images = assets.missing([BACKGROUND, FLOOR, PIPE] + BIRD_FRAMES)
+if missing_images:
+    print(f"Erro ao carregar imagem: {', '.join(missing_images)} não encontrada(s)")
     print("Verifique se a pasta 'assets' existe e contém todas as imagens .png no mesmo diretório do script.")
     sys.exit()
 
@@ -61,7 +67,7 @@ if not HEADLESS_MODE:
     score_font = pygame.font.Font("freesansbold.ttf", 27)
 
 class Bird:
-    IMGS = BIRDS_IMGS
+    IMGS = BIRD_FRAMES
     MAX_ROTATION = 25
     ROT_VEL = 20
     ANIMATION_TIME = 5
@@ -125,30 +131,35 @@ class Bird:
             self.img = self.IMGS[1]
             self.img_count = self.ANIMATION_TIME*2
 
-        rotated_image = pygame.transform.rotate(self.img, self.tilt)
-        new_rect = rotated_image.get_rect(center=self.img.get_rect(topleft=(self.x, self.y)).center)
+        rotated_image = assets.surface(self.img, angle=self.tilt)
+        new_rect = rotated_image.get_rect(center=assets.image(self.img).get_rect(topleft=(self.x, self.y)).center)
         win.blit(rotated_image, new_rect.topleft)
 
     def get_mask(self):
-        return pygame.mask.from_surface(self.img)
+        return assets.mask(self.img)
 
 class Pipe:
     GAP = 200
     VEL = 5
+    # Dimensões lidas do cabeçalho do PNG (sem decodificar a imagem)
+    WIDTH, HEIGHT = assets.size(PIPE)
 
-    def __init__(self, x):
+    def __init__(self, x, gap=None, vel=None):
         self.x = x
         self.height = 0
         self.top = 0
         self.bottom = 0
-        self.PIPE_TOP = pygame.transform.flip(pipe_img, False, True)
-        self.PIPE_BOTTOM = pipe_img
         self.passed = False
+        # Sem argumentos, usa as constantes da classe (dificuldade original)
+        if gap is not None:
+            self.GAP = gap
+        if vel is not None:
+            self.VEL = vel
         self.set_height()
 
     def set_height(self):
         self.height = random.randrange(50, 400)
-        self.top = self.height - self.PIPE_TOP.get_height()
+        self.top = self.height - self.HEIGHT
         self.bottom = self.height + self.GAP
 
     def move(self):
@@ -157,13 +168,13 @@ class Pipe:
     def draw(self, win):
         if HEADLESS_MODE or not SHOW_GRAPHICS:
             return
-        win.blit(self.PIPE_TOP, (self.x, self.top))
-        win.blit(self.PIPE_BOTTOM, (self.x, self.bottom))
+        win.blit(assets.surface(PIPE, flip_y=True), (self.x, self.top))
+        win.blit(assets.image(PIPE), (self.x, self.bottom))
         
     def collide(self, bird):
         bird_mask = bird.get_mask()
-        top_mask = pygame.mask.from_surface(self.PIPE_TOP)
-        bottom_mask = pygame.mask.from_surface(self.PIPE_BOTTOM)
+        top_mask = assets.mask(PIPE, flip_y=True)
+        bottom_mask = assets.mask(PIPE)
 
         top_offset = (self.x - bird.x, self.top - round(bird.y))
         bottom_offset = (self.x - bird.x, self.bottom - round(bird.y))
@@ -177,11 +188,13 @@ class Pipe:
 
 class Floor:
     VEL = 5
-    WIDTH = floor_img.get_width()
-    IMG = floor_img
+    WIDTH = assets.size(FLOOR)[0]
+    IMG = FLOOR
 
-    def __init__(self, y):
+    def __init__(self, y, vel=None):
         self.y = y
+        if vel is not None:
+            self.VEL = vel
         self.x1 = 0
         self.x2 = self.WIDTH
 
@@ -196,15 +209,16 @@ class Floor:
     def draw(self, win):
         if HEADLESS_MODE or not SHOW_GRAPHICS:
             return
-        win.blit(self.IMG, (self.x1, self.y))
-        win.blit(self.IMG, (self.x2, self.y))
+        img = assets.image(self.IMG)
+        win.blit(img, (self.x1, self.y))
+        win.blit(img, (self.x2, self.y))
 
 
 def draw_window(win, birds, pipes, floor, score, gen):
     if HEADLESS_MODE or not SHOW_GRAPHICS:
         return
     
-    win.blit(back_img, (0,0))
+    win.blit(assets.image(BACKGROUND), (0,0))
     
     for pipe in pipes:
         pipe.draw(win)
@@ -245,16 +259,27 @@ def eval_genomes(genomes, config):
     ge = []
     birds = []
 
-    for _, g in genomes:
+    for i, (_, g) in enumerate(genomes):
         net = neat.nn.FeedForwardNetwork.create(g, config)
         nets.append(net)
         birds.append(Bird(67, 300))
-        g.fitness = 0 # Inicia a "aptidão" (pontuação) de cada pássaro com 0
-        ge.append(g)
+        ge.append(i)  # Índice do genoma no array de fitness
+
+    # "Aptidão" (pontuação) de toda a população, atualizada de uma vez a cada frame
+    fitness = np.zeros(len(genomes))
+    fitness_pipeline.reset()
+
+    # Dificuldade da geração: original, ou a escolhida pelo curriculum
+    if curriculum is not None:
+        difficulty = curriculum.current
+    else:
+        difficulty = Difficulty(gap=Pipe.GAP, vel=Pipe.VEL, spawn_x=700)
 
-    floor = Floor(FLOOR_Y)
-    pipes = [Pipe(700)]  # Cano mais longe para dar tempo
+    floor = Floor(FLOOR_Y, difficulty.vel)
+    pipes = [Pipe(difficulty.spawn_x, difficulty.gap, difficulty.vel)]  # Cano mais longe para dar tempo
     score = 0
+    # Pássaros que passaram pelo primeiro cano (taxa de passagem do curriculum)
+    passed = 0
     
     # Contador de frames para limitar tempo máximo por geração
     frame_count = 0
@@ -273,29 +298,16 @@ def eval_genomes(genomes, config):
         frame_count += 1
         pipe_ind = 0
         if len(birds) > 0:
-            if len(pipes) > 1 and birds[0].x > pipes[0].x + pipes[0].PIPE_TOP.get_width():
+            if len(pipes) > 1 and birds[0].x > pipes[0].x + Pipe.WIDTH:
                 pipe_ind = 1
 
+        gap_center = pipes[pipe_ind].height + pipes[pipe_ind].GAP/2
+
         for x, bird in enumerate(birds):
             bird.move()
-            
-            # Fitness generoso por estar vivo
-            ge[x].fitness += 0.1
-            
-            # Recompensa por se aproximar horizontalmente do cano
-            distance_to_pipe = pipes[pipe_ind].x - bird.x
-            if distance_to_pipe > 0:  # Ainda não passou
-                ge[x].fitness += max(0, (500 - distance_to_pipe) / 100)
-            
-            # Recompensa por estar na altura certa do gap
-            gap_center = pipes[pipe_ind].height + pipes[pipe_ind].GAP/2
-            vertical_distance_to_center = abs(bird.y - gap_center)
-            if vertical_distance_to_center < 100:  # Próximo do centro
-                ge[x].fitness += (100 - vertical_distance_to_center) / 20
 
             # ### NEAT: Input SUPER simplificado ###
             # Input 1: Quão acima ou abaixo do centro do gap o pássaro está
-            gap_center = pipes[pipe_ind].height + pipes[pipe_ind].GAP/2
             vertical_diff = (bird.y - gap_center) / 100  # -3 a +3 aproximadamente
             
             # Input 2: Distância até o cano (normalizada)
@@ -307,9 +319,16 @@ def eval_genomes(genomes, config):
             output = nets[x].activate((vertical_diff, horizontal_dist, velocity))
 
             # Limiar mais baixo para pular
-            if output[0] > 0.3:  # Mudado de 0.5 para 0.3
+            if output[0] > JUMP_THRESHOLD:  # Mudado de 0.5 para 0.3
                 bird.jump()
 
+        # Fitness de todos os pássaros vivos (termos vetorizados do fitness_pipeline)
+        fitness_pipeline.step(fitness, ge, FrameState(
+            bird_x=np.array([bird.x for bird in birds], dtype=float),
+            bird_y=np.array([bird.y for bird in birds], dtype=float),
+            pipe_x=pipes[pipe_ind].x,
+            gap_center=gap_center))
+
         # Movimentação dos canos e checagem de colisões
         rem = []
         add_pipe = False
@@ -323,12 +342,14 @@ def eval_genomes(genomes, config):
             
             for x, bird in enumerate(birds):
                 # Verificar se passou pelo cano - MAIS GENEROSO
-                if not pipe.passed and bird.x >= pipe.x + pipe.PIPE_TOP.get_width() - 10:  # 10px antes
+                if not pipe.passed and bird.x >= pipe.x + Pipe.WIDTH - 10:  # 10px antes
                     pipe.passed = True
                     add_pipe = True
+                    if score == 0:
+                        passed = len(birds)
                     
                     # RECOMPENSA GIGANTESCA por passar pelo cano
-                    ge[x].fitness += 5000  # Ainda maior!
+                    fitness_pipeline.award("pipe_passed", fitness, ge[x])
                     print(f"🎉🎉🎉 SUCESSO! Pássaro {x} passou pelo cano na geração {gen}! 🎉🎉🎉")
                 
                 # Colisão MUITO mais permissiva
@@ -349,13 +370,13 @@ def eval_genomes(genomes, config):
                 ge.pop(x)
 
             # Remove canos que saíram da tela
-            if pipe.x + pipe.PIPE_TOP.get_width() < 0:
+            if pipe.x + Pipe.WIDTH < 0:
                 rem.append(pipe)
 
         # Adiciona novo cano quando algum pássaro passou
         if add_pipe:
             score += 1
-            pipes.append(Pipe(700))  # Próximo cano mais longe
+            pipes.append(Pipe(difficulty.spawn_x, difficulty.gap, difficulty.vel))  # Próximo cano mais longe
             print(f"🏆 SCORE AUMENTOU! Score atual: {score}")
 
         # Remove canos antigos
@@ -380,10 +401,18 @@ def eval_genomes(genomes, config):
         if not HEADLESS_MODE and SHOW_GRAPHICS and frame_count % 2 == 0:
             draw_window(screen, birds, pipes, floor, score, gen)
 
+    for reporter in episode_reporters:
+        reporter.record_episode(score=score, frames=frame_count,
+                                passed=passed, population=len(genomes))
+
+    for (_, g), f in zip(genomes, fitness):
+        g.fitness = float(f)
+
     # Imprimir estatísticas da geração
+    print(f"Contribuição dos termos de fitness: {fitness_pipeline.report()}")
     if len(ge) > 0:
-        max_fitness = max(g.fitness for g in ge)
-        avg_fitness = sum(g.fitness for g in ge) / len(ge)
+        max_fitness = max(fitness[ge])
+        avg_fitness = sum(fitness[ge]) / len(ge)
         if score > 0:
             print(f"🏆🏆🏆 Geração {gen}: SUCESSO! Score = {score}, Melhor fitness = {max_fitness:.2f} 🏆🏆🏆")
         else:
@@ -394,26 +423,63 @@ def eval_genomes(genomes, config):
 
 # ### NEAT: Função para rodar o NEAT
 def run(config_path):
+    global curriculum, fitness_pipeline
+    # NumpySpeciesSet: mesma especiação do DefaultSpeciesSet, distâncias calculadas em lote
     config = neat.config.Config(neat.DefaultGenome, neat.DefaultReproduction,
-                                neat.DefaultSpeciesSet, neat.DefaultStagnation,
+                                NumpySpeciesSet, neat.DefaultStagnation,
                                 config_path)
     
+    fitness_pipeline = FitnessPipeline.from_config(config_path)
+
     # Cria a população
     p = neat.Population(config)
 
     # Adiciona "reporters" para mostrar o progresso no terminal
     p.add_reporter(neat.StdOutReporter(True))
-    stats = neat.StatisticsReporter()
+    # Métricas gravadas em disco a cada geração (memória constante)
+    stats = StreamingMetricsReporter("metrics.csv")
     p.add_reporter(stats)
+    episode_reporters.append(stats)
+
+    if CURRICULUM_MODE:
+        # Quem encerra o treino é o curriculum, e só a partir do nível original
+        config.no_fitness_termination = True
+        curriculum = CurriculumScheduler()
+        p.add_reporter(curriculum)
+        episode_reporters.append(curriculum)
 
     # ### NEAT: Roda a simulação até encontrar solução ou atingir limite
-    winner = p.run(eval_genomes, 1000)
+    try:
+        winner = p.run(eval_genomes, 1000)
+        if curriculum is not None:
+            # Sem solução: o melhor genoma no nível original, nunca o de um nível fácil
+            winner = curriculum.best
+            if winner is None:
+                print(f"⚠️ Nenhum genoma foi avaliado no nível original do curriculum "
+                      f"({curriculum.levels[curriculum.target_level]}); winner.pkl não foi alterado")
+    except CurriculumSolved as solved:
+        winner = solved.winner
+        print(f"🏆 Solução encontrada no nível {curriculum.level} do curriculum: {curriculum.current}")
+    finally:
+        episode_reporters.remove(stats)
+        stats.close()
+        if curriculum is not None:
+            episode_reporters.remove(curriculum)
+            curriculum = None
     
+    # Topologia podada e curvas em JSON/SVG (sem graphviz/matplotlib);
+    # gráficos completos depois com: python visualize.py --genome winner.pkl --plot
+    visualize.export_curves(stats.filename)
+    if winner is None:
+        return
+
     # Mostra as estatísticas do melhor genoma encontrado
     print('\nMelhor genoma:\n{!s}'.format(winner))
     with open('winner.pkl', 'wb') as output:
       pickle.dump(winner, output, 1)
 
+    visualize.export_topology(winner, config)
+
 if __name__ == "__main__":
     local_dir = os.path.dirname(__file__)
     config_path = os.path.join(local_dir, "config-feedforward.txt")
@@ -0,0 +1,80 @@
+import csv
+import os
+import time
+
+import neat
+from neat.math_util import mean, stdev
+
+# Colunas gravadas por geração (uma linha por geração, sem histórico em memória)
+FIELDS = ["generation", "best_fitness", "mean_fitness", "std_fitness",
+          "species", "score", "frames", "gen_time", "wall_time"]
+
+
+class StreamingMetricsReporter(neat.reporting.BaseReporter):
+    """Grava as métricas de cada geração em um CSV à medida que o treino avança.
+
+    Substitui o neat.StatisticsReporter, que guarda todos os genomas e espécies
+    em memória até o fim do treino. Aqui só a geração atual fica em memória e
+    cada linha é escrita (e descarregada) logo após a avaliação, então o arquivo
+    pode ser acompanhado com `tail -f` e sobrevive a uma interrupção.
+    """
+
+    def __init__(self, filename="metrics.csv", append=False):
+        self.filename = filename
+        resume = append and os.path.exists(filename) and os.path.getsize(filename) > 0
+        self._file = open(filename, "a" if resume else "w", newline="")
+        self._writer = csv.DictWriter(self._file, fieldnames=FIELDS)
+        if not resume:
+            self._writer.writeheader()
+            self._file.flush()
+
+        self.generation = None
+        self._start_time = time.time()
+        self._gen_start = None
+        self._episode = {}
+
+    def record_episode(self, score=0, frames=0, **_):
+        # Chamado por eval_genomes ao fim da simulação de cada geração
+        self._episode = {"score": score, "frames": frames}
+
+    def start_generation(self, generation):
+        self.generation = generation
+        self._gen_start = time.time()
+        self._episode = {}
+
+    def post_evaluate(self, config, population, species, best_genome):
+        fitnesses = [g.fitness for g in population.values() if g.fitness is not None]
+        now = time.time()
+        self._writer.writerow({
+            "generation": self.generation,
+            "best_fitness": round(best_genome.fitness, 4),
+            "mean_fitness": round(mean(fitnesses), 4),
+            "std_fitness": round(stdev(fitnesses), 4),
+            "species": len(species.species),
+            "score": self._episode.get("score", 0),
+            "frames": self._episode.get("frames", 0),
+            "gen_time": round(now - self._gen_start, 4),
+            "wall_time": round(now - self._start_time, 4),
+        })
+        self._file.flush()
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+
+def read_metrics(filename):
+    # Gerador: lê as linhas uma a uma, sem carregar o arquivo inteiro
+    with open(filename, newline="") as f:
+        for row in csv.DictReader(f):
+            yield {
+                "generation": int(row["generation"]),
+                "best_fitness": float(row["best_fitness"]),
+                "mean_fitness": float(row["mean_fitness"]),
+                "std_fitness": float(row["std_fitness"]),
+                "species": int(row["species"]),
+                "score": int(row["score"]),
+                "frames": int(row["frames"]),
+                "gen_time": float(row["gen_time"]),
+                "wall_time": float(row["wall_time"]),
+            }
@@ -3,8 +3,11 @@ import neat
 import os
 import pickle
 import sys
+from assets import assets, BACKGROUND, FLOOR, PIPE, BIRD_FRAMES
+from constants import JUMP_THRESHOLD
+from speciation import NumpySpeciesSet
 
-def play_best_bird(config_path, genome_path="winner.pkl"):
+def play_best_bird(config_path, genome_path="winner.pkl", table_path=None):
     print("🎮 Iniciando jogo com AI...")
     
     # Limpar variáveis de ambiente do pygame
@@ -20,7 +23,7 @@ def play_best_bird(config_path, genome_path="winner.pkl"):
     # Carrega a configuração do NEAT
     try:
         config = neat.config.Config(neat.DefaultGenome, neat.DefaultReproduction,
-                                    neat.DefaultSpeciesSet, neat.DefaultStagnation,
+                                    NumpySpeciesSet, neat.DefaultStagnation,
                                     config_path)
         print("✅ Configuração NEAT carregada")
     except Exception as e:
@@ -47,21 +50,27 @@ def play_best_bird(config_path, genome_path="winner.pkl"):
         print(f"❌ Erro ao criar rede neural: {e}")
         return
 
-    # Tentar carregar imagens - se falhar, usar formas simples
-    images_loaded = False
-    try:
-        back_img = pygame.image.load("img_46.png").convert()
-        floor_img = pygame.image.load("img_50.png").convert()
-        pipe_img = pygame.image.load("greenpipe.png").convert()
-        bird_img = pygame.image.load("img_48.png").convert()
-        images_loaded = True
-        print("✅ Imagens carregadas da pasta raiz")
-    except:
-        print("⚠️ Imagens não encontradas, usando gráficos simples")
+    # Tabela de decisões pré-calculada (opcional): substitui a ativação da rede
+    table = None
+    if table_path is not None:
+        try:
+            from policy_table import PolicyTable
+            table = PolicyTable.load(table_path)
+            print(f"✅ Tabela de política carregada: {table.bins}")
+        except Exception as e:
+            print(f"⚠️ Erro ao carregar tabela ({e}), usando a rede neural")
 
     # Configurar janela
     win = pygame.display.set_mode((WIDTH, HEIGHT))
     pygame.display.set_caption("Flappy Bird - AI Campeão")
+
+    # Imagens carregadas sob demanda pelo AssetManager - se faltarem, usar formas simples
+    missing_images = assets.missing([BACKGROUND, FLOOR, PIPE, BIRD_FRAMES[1]])
+    images_loaded = not missing_images
+    if images_loaded:
+        print(f"✅ Imagens encontradas em {assets.directory}")
+    else:
+        print(f"⚠️ Imagens não encontradas ({', '.join(missing_images)}), usando gráficos simples")
     clock = pygame.time.Clock()
     font = pygame.font.Font(None, 36)
 
@@ -146,11 +155,15 @@ def play_best_bird(config_path, genome_path="winner.pkl"):
         horizontal_dist = max(0, pipes[pipe_ind].x - bird.x) / 400
         velocity = bird.vel / 10
 
-        # Ativar rede neural
+        # Ativar rede neural (ou consultar a tabela)
         try:
-            output = net.activate((vertical_diff, horizontal_dist, velocity))
-            if output[0] > 0.3:  # Mesmo limiar do treinamento
-                bird.jump()
+            if table is not None:
+                if table.decide((vertical_diff, horizontal_dist, velocity)):
+                    bird.jump()
+            else:
+                output = net.activate((vertical_diff, horizontal_dist, velocity))
+                if output[0] > JUMP_THRESHOLD:  # Mesmo limiar do treinamento
+                    bird.jump()
         except Exception as e:
             print(f"❌ Erro na rede neural: {e}")
             break
@@ -204,20 +217,22 @@ def play_best_bird(config_path, genome_path="winner.pkl"):
 
         if images_loaded:
             # Desenhar com imagens
-            win.blit(back_img, (0, 0))
+            win.blit(assets.image(BACKGROUND), (0, 0))
             
-            # Canos
+            # Canos (versão espelhada fica em cache)
+            pipe_top = assets.surface(PIPE, flip_y=True)
+            pipe_bottom = assets.image(PIPE)
             for pipe in pipes:
-                pipe_top = pygame.transform.flip(pipe_img, False, True)
-                win.blit(pipe_top, (pipe.x, pipe.height - pipe_img.get_height()))
-                win.blit(pipe_img, (pipe.x, pipe.height + pipe.GAP))
+                win.blit(pipe_top, (pipe.x, pipe.height - pipe_top.get_height()))
+                win.blit(pipe_bottom, (pipe.x, pipe.height + pipe.GAP))
             
             # Chão
+            floor_img = assets.image(FLOOR)
             win.blit(floor_img, (floor.x1, FLOOR_Y))
             win.blit(floor_img, (floor.x2, FLOOR_Y))
             
             # Pássaro
-            win.blit(bird_img, (bird.x, bird.y))
+            win.blit(assets.image(BIRD_FRAMES[1]), (bird.x, bird.y))
         else:
             # Desenhar com formas simples
             # Chão
@@ -266,7 +281,9 @@ if __name__ == '__main__':
             input("Pressione Enter para fechar...")
             sys.exit(1)
             
-        play_best_bird(config_path)
+        # Uso: python play_winner.py [policy_table.pkl]
+        table_path = sys.argv[1] if len(sys.argv) > 1 else None
+        play_best_bird(config_path, table_path=table_path)
         
     except Exception as e:
         print(f"❌ Erro inesperado: {e}")
@@ -0,0 +1,108 @@
+import os
+import pickle
+import sys
+import time
+
+import neat
+import numpy as np
+
+from constants import JUMP_THRESHOLD
+from speciation import NumpySpeciesSet
+
+# Faixas dos três inputs da rede (mesmas fórmulas do treinamento):
+#   vertical_diff   = (bird.y - gap_center) / 100
+#   horizontal_dist = max(0, pipe.x - bird.x) / 400
+#   velocity        = bird.vel / 10
+RANGES = ((-5.0, 4.0), (0.0, 1.6), (-2.0, 2.0))
+BINS = (128, 64, 16)
+
+
+class PolicyTable:
+    """Decisão de pulo da rede pré-calculada numa grade quantizada dos inputs.
+
+    Cada célula guarda um bit (pula / não pula) avaliado no centro da célula,
+    então a decisão em jogo vira uma consulta O(1) sem ativar a rede.
+    Valores fora das faixas são presos à borda da grade.
+    """
+
+    def __init__(self, bits, bins=BINS, ranges=RANGES, threshold=JUMP_THRESHOLD):
+        self.bins = tuple(bins)
+        self.ranges = tuple(tuple(r) for r in ranges)
+        self.threshold = threshold
+        self.bits = np.asarray(bits, dtype=np.uint8)
+        self._table = np.unpackbits(self.bits, count=int(np.prod(self.bins))).astype(bool).reshape(self.bins)
+        self._lo = np.array([r[0] for r in self.ranges])
+        self._scale = np.array([n / (r[1] - r[0]) for n, r in zip(self.bins, self.ranges)])
+        self._max = np.array(self.bins) - 1
+
+    @classmethod
+    def build(cls, net, bins=BINS, ranges=RANGES, threshold=JUMP_THRESHOLD):
+        axes = [lo + (np.arange(n) + 0.5) * (hi - lo) / n for n, (lo, hi) in zip(bins, ranges)]
+        table = np.zeros(bins, dtype=bool)
+        for i, vertical_diff in enumerate(axes[0]):
+            for j, horizontal_dist in enumerate(axes[1]):
+                for k, velocity in enumerate(axes[2]):
+                    output = net.activate((vertical_diff, horizontal_dist, velocity))
+                    table[i, j, k] = output[0] > threshold
+        return cls(np.packbits(table.ravel()), bins, ranges, threshold)
+
+    def index(self, inputs):
+        idx = []
+        for value, lo, scale, top in zip(inputs, self._lo, self._scale, self._max):
+            i = int((value - lo) * scale)
+            idx.append(0 if i < 0 else top if i > top else i)
+        return tuple(idx)
+
+    def decide(self, inputs):
+        return bool(self._table[self.index(inputs)])
+
+    def decide_batch(self, inputs):
+        # inputs: array (N, 3) -> array (N,) de bool
+        idx = ((np.asarray(inputs, dtype=float) - self._lo) * self._scale).astype(int)
+        idx = np.clip(idx, 0, self._max)
+        return self._table[idx[:, 0], idx[:, 1], idx[:, 2]]
+
+    def disagreement(self, net, samples=20000, seed=0):
+        # Fração de estados aleatórios (dentro das faixas) em que tabela e rede discordam
+        rng = np.random.default_rng(seed)
+        states = np.column_stack([rng.uniform(lo, hi, samples) for lo, hi in self.ranges])
+        table_jumps = self.decide_batch(states)
+        net_jumps = np.array([net.activate(tuple(s))[0] > self.threshold for s in states])
+        return float(np.mean(table_jumps != net_jumps))
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            pickle.dump({"bits": self.bits, "bins": self.bins, "ranges": self.ranges,
+                         "threshold": self.threshold}, f)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            data = pickle.load(f)
+        return cls(data["bits"], data["bins"], data["ranges"], data["threshold"])
+
+
+def build_from_winner(config_path, genome_path="winner.pkl", output_path="policy_table.pkl"):
+    config = neat.config.Config(neat.DefaultGenome, neat.DefaultReproduction,
+                                NumpySpeciesSet, neat.DefaultStagnation,
+                                config_path)
+    with open(genome_path, "rb") as f:
+        genome = pickle.load(f)
+    net = neat.nn.FeedForwardNetwork.create(genome, config)
+
+    start = time.time()
+    table = PolicyTable.build(net)
+    print(f"✅ Tabela {table.bins} gerada em {time.time() - start:.1f}s ({table.bits.nbytes} bytes)")
+    print(f"📊 Discordância com a rede: {table.disagreement(net):.2%}")
+
+    table.save(output_path)
+    print(f"💾 Tabela salva em {output_path}")
+    return table
+
+
+if __name__ == "__main__":
+    local_dir = os.path.dirname(__file__)
+    config_path = os.path.join(local_dir, "config-feedforward.txt")
+    genome_path = sys.argv[1] if len(sys.argv) > 1 else "winner.pkl"
+    output_path = sys.argv[2] if len(sys.argv) > 2 else "policy_table.pkl"
+    build_from_winner(config_path, genome_path, output_path)
@@ -0,0 +1,261 @@
+from itertools import chain, repeat
+
+import numpy as np
+from neat.math_util import mean, stdev
+from neat.six_util import iteritems, iterkeys, itervalues
+from neat.species import DefaultSpeciesSet, GenomeDistanceCache, Species
+
+
+class GenomeEncoding:
+    """Genes de um conjunto de genomas em arrays densos indexados pela chave (inovação).
+
+    Cada genoma vira uma linha; cada chave de nó ou conexão vira uma coluna.
+    Genes ausentes ficam marcados como False em `*_present`.
+    """
+
+    def __init__(self, genomes):
+        self.rows = {}
+        node_cols, conn_cols, codes = {}, {}, {}
+        for g in genomes:
+            if id(g) in self.rows:
+                continue
+            self.rows[id(g)] = len(self.rows)
+            for k in g.nodes:
+                node_cols.setdefault(k, len(node_cols))
+            for k in g.connections:
+                conn_cols.setdefault(k, len(conn_cols))
+
+        n = len(self.rows)
+        self.node_cols = node_cols
+        self.conn_cols = conn_cols
+        self.n_nodes = np.zeros(n, dtype=np.int64)
+        self.n_conns = np.zeros(n, dtype=np.int64)
+        self.node_present = np.zeros((n, len(node_cols)), dtype=bool)
+        self.bias = np.zeros((n, len(node_cols)))
+        self.response = np.zeros((n, len(node_cols)))
+        self.activation = np.zeros((n, len(node_cols)), dtype=np.int64)
+        self.aggregation = np.zeros((n, len(node_cols)), dtype=np.int64)
+        self.conn_present = np.zeros((n, len(conn_cols)), dtype=bool)
+        self.weight = np.zeros((n, len(conn_cols)))
+        self.enabled = np.zeros((n, len(conn_cols)), dtype=bool)
+
+        for g in genomes:
+            r = self.rows[id(g)]
+            self.n_nodes[r] = len(g.nodes)
+            self.n_conns[r] = len(g.connections)
+            for k, node in g.nodes.items():
+                c = node_cols[k]
+                self.node_present[r, c] = True
+                self.bias[r, c] = node.bias
+                self.response[r, c] = node.response
+                self.activation[r, c] = codes.setdefault(node.activation, len(codes))
+                self.aggregation[r, c] = codes.setdefault(node.aggregation, len(codes))
+            for k, conn in g.connections.items():
+                c = conn_cols[k]
+                self.conn_present[r, c] = True
+                self.weight[r, c] = conn.weight
+                self.enabled[r, c] = conn.enabled
+
+    def distances(self, genome0, genomes, config):
+        """Mesmo resultado de genome0.distance(g, config) para cada g, calculado em lote.
+
+        Os termos homólogos são somados com cumsum na ordem das chaves de genome0,
+        a mesma ordem de soma do DefaultGenome.distance, então os valores são idênticos.
+        """
+        r0 = self.rows[id(genome0)]
+        rows = np.array([self.rows[id(g)] for g in genomes], dtype=np.int64)
+        wc = config.compatibility_weight_coefficient
+        dc = config.compatibility_disjoint_coefficient
+
+        # Componente dos nós
+        cols = np.array([self.node_cols[k] for k in genome0.nodes], dtype=np.int64)
+        sel = np.ix_(rows, cols)
+        present = self.node_present[sel]
+        d = (np.abs(self.bias[r0, cols] - self.bias[sel]) +
+             np.abs(self.response[r0, cols] - self.response[sel]))
+        d += self.activation[r0, cols] != self.activation[sel]
+        d += self.aggregation[r0, cols] != self.aggregation[sel]
+        node_distance = self._combine(d * wc, present, len(genome0.nodes), self.n_nodes[rows], dc)
+
+        # Componente das conexões
+        cols = np.array([self.conn_cols[k] for k in genome0.connections], dtype=np.int64)
+        sel = np.ix_(rows, cols)
+        present = self.conn_present[sel]
+        d = np.abs(self.weight[r0, cols] - self.weight[sel])
+        d += self.enabled[r0, cols] != self.enabled[sel]
+        conn_distance = self._combine(d * wc, present, len(genome0.connections), self.n_conns[rows], dc)
+
+        return node_distance + conn_distance
+
+    @staticmethod
+    def _combine(gene_distance, present, size0, sizes, disjoint_coefficient):
+        gene_distance = np.where(present, gene_distance, 0.0)
+        if gene_distance.shape[1]:
+            homologous = np.cumsum(gene_distance, axis=1)[:, -1]
+        else:
+            homologous = np.zeros(len(sizes))
+        matched = present.sum(axis=1)
+        disjoint = (sizes - matched) + (size0 - matched)
+        largest = np.maximum(size0, sizes)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            result = (homologous + disjoint_coefficient * disjoint) / largest
+        return np.where(largest > 0, result, 0.0)
+
+
+class BatchGenomeDistanceCache(GenomeDistanceCache):
+    """GenomeDistanceCache que consulta distâncias pré-calculadas em lote.
+
+    `prefetch` calcula com NumPy as distâncias de um representante para vários
+    genomas e guarda em `memo[chave do representante][chave do genoma]`
+    (por direção, compartilhado entre gerações).
+    `row` devolve essas distâncias como array, com o mesmo valor que `__call__`
+    devolveria para cada par, e `record` grava os pares consultados no cache na
+    mesma ordem do laço original. `__call__` mantém exatamente a lógica do cache original.
+    """
+
+    def __init__(self, config, encoding, memo):
+        super().__init__(config)
+        self.encoding = encoding
+        self.memo = memo
+
+    def prefetch(self, genome0, genomes):
+        k0 = genome0.key
+        known = self.memo.setdefault(k0, {})
+        todo = [g for g in genomes if g.key not in known]
+        if todo:
+            d = self.encoding.distances(genome0, todo, self.config)
+            known.update(zip([g.key for g in todo], d.tolist()))
+
+    def row(self, genome0, genomes):
+        self.prefetch(genome0, genomes)
+        k0 = genome0.key
+        keys = [g.key for g in genomes]
+        # Pares já no cache têm prioridade (podem ter sido calculados na outra direção)
+        cached = np.array(list(map(self.distances.get, zip(repeat(k0), keys))), dtype=float)
+        known = np.array(list(map(self.memo[k0].get, keys)), dtype=float)
+        return np.where(np.isnan(cached), known, cached)
+
+    def record(self, keys0, keys1, values):
+        # Equivale a chamar __call__ para cada par (keys0[i], keys1[i]), em ordem
+        size = len(self.distances)
+        pairs = chain.from_iterable(zip(zip(keys0, keys1), zip(keys1, keys0)))
+        values = chain.from_iterable(zip(values, values))
+        self.distances.update(zip(pairs, values))
+        misses = (len(self.distances) - size + 1) // 2
+        self.misses += misses
+        self.hits += len(keys0) - misses
+
+    def __call__(self, genome0, genome1):
+        g0 = genome0.key
+        g1 = genome1.key
+        d = self.distances.get((g0, g1))
+        if d is None:
+            d = self.memo.get(g0, {}).get(g1)
+            if d is None:
+                d = genome0.distance(genome1, self.config)
+            self.distances[g0, g1] = d
+            self.distances[g1, g0] = d
+            self.misses += 1
+        else:
+            self.hits += 1
+        return d
+
+
+class NumpySpeciesSet(DefaultSpeciesSet):
+    """DefaultSpeciesSet com as distâncias genéticas calculadas em lote (NumPy).
+
+    A partição em espécies é idêntica à do DefaultSpeciesSet: o algoritmo e a
+    ordem em que os genomas são retirados são os mesmos; as distâncias de cada
+    representante são calculadas de uma vez e a escolha da espécie é feita
+    sobre arrays. Lê a seção [NumpySpeciesSet] do config (compatibility_threshold).
+    """
+
+    def __init__(self, config, reporters):
+        super().__init__(config, reporters)
+        self.distance_memo = {}
+
+    def speciate(self, config, population, generation):
+        assert isinstance(population, dict)
+
+        compatibility_threshold = self.species_set_config.compatibility_threshold
+
+        encoding = GenomeEncoding(list(population.values()) +
+                                  [s.representative for s in self.species.values()])
+
+        # Find the best representatives for each existing species.
+        # Mesmo set do DefaultSpeciesSet: a ordem do pop() depende de como ele é construído.
+        unspeciated = set(iterkeys(population))
+        distances = BatchGenomeDistanceCache(config.genome_config, encoding, self.distance_memo)
+        new_representatives = {}
+        new_members = {}
+        for sid, s in iteritems(self.species):
+            candidates = list(unspeciated)
+            d = distances.row(s.representative, [population[gid] for gid in candidates])
+            distances.record([s.representative.key] * len(candidates), candidates, d.tolist())
+
+            # The new representative is the genome closest to the current representative.
+            new_rid = candidates[int(np.argmin(d))]
+            new_representatives[sid] = new_rid
+            new_members[sid] = [new_rid]
+            unspeciated.remove(new_rid)
+
+        # Distâncias de cada representante para os genomas ainda sem espécie:
+        # linha r = representante r (na ordem de new_representatives), coluna = genoma
+        columns = dict((gid, i) for i, gid in enumerate(unspeciated))
+        remaining = [population[gid] for gid in columns]
+        sids = list(new_representatives)
+        rids = list(new_representatives.values())
+        rep_distances = np.full((max(len(sids), 1) * 2, len(columns)), np.inf)
+        for r, rid in enumerate(rids):
+            rep_distances[r] = distances.row(population[rid], remaining)
+
+        # Partition population into species based on genetic similarity.
+        while unspeciated:
+            gid = unspeciated.pop()
+            g = population[gid]
+
+            # Find the species with the most similar representative
+            # (argmin devolve o primeiro mínimo, como o min() do laço original).
+            d = rep_distances[:len(sids), columns[gid]]
+            distances.record(rids, [gid] * len(rids), d.tolist())
+            candidates = np.flatnonzero(d < compatibility_threshold)
+
+            if len(candidates):
+                sid = sids[candidates[np.argmin(d[candidates])]]
+                new_members[sid].append(gid)
+            else:
+                # No species is similar enough, create a new species, using
+                # this genome as its representative.
+                sid = next(self.indexer)
+                new_representatives[sid] = gid
+                new_members[sid] = [gid]
+                if len(sids) == len(rep_distances):
+                    rep_distances = np.vstack([rep_distances, np.full_like(rep_distances, np.inf)])
+                others = [columns[other] for other in unspeciated]
+                rep_distances[len(sids), others] = distances.row(g, [population[o] for o in unspeciated])
+                sids.append(sid)
+                rids.append(gid)
+
+        # Update species collection based on new speciation.
+        self.genome_to_species = {}
+        for sid, rid in iteritems(new_representatives):
+            s = self.species.get(sid)
+            if s is None:
+                s = Species(sid, generation)
+                self.species[sid] = s
+
+            members = new_members[sid]
+            for gid in members:
+                self.genome_to_species[gid] = sid
+
+            member_dict = dict((gid, population[gid]) for gid in members)
+            s.update(population[rid], member_dict)
+
+        # Na próxima geração só as distâncias a partir dos representantes atuais servem
+        self.distance_memo = dict((rid, self.distance_memo.get(rid, {}))
+                                  for rid in new_representatives.values())
+
+        gdmean = mean(itervalues(distances.distances))
+        gdstdev = stdev(itervalues(distances.distances))
+        self.reporters.info(
+            'Mean genetic distance {0:.3f}, standard deviation {1:.3f}'.format(gdmean, gdstdev))
@@ -0,0 +1,215 @@
+import argparse
+import contextlib
+import csv
+import io
+import itertools
+import json
+import os
+import random
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from configparser import ConfigParser
+
+import neat
+
+LOCAL_DIR = os.path.dirname(os.path.abspath(__file__))
+BASE_CONFIG = os.path.join(LOCAL_DIR, "config-feedforward.txt")
+
+# Parâmetros que não estão no config e são aplicados direto no flappy_ai
+GAME_PARAMS = {"jump_threshold": "JUMP_THRESHOLD"}
+
+
+class BudgetExceeded(Exception):
+    pass
+
+
+class BudgetReporter(neat.reporting.BaseReporter):
+    """Interrompe o treino quando o tempo acaba e guarda o resultado do job."""
+
+    def __init__(self, max_seconds):
+        self.max_seconds = max_seconds
+        self.start = time.time()
+        self.generations = 0
+        self.solved_at = None
+        self.best_score = 0
+
+    def record_episode(self, score=0, **_):
+        self.best_score = max(self.best_score, score)
+
+    def start_generation(self, generation):
+        if self.max_seconds is not None and time.time() - self.start > self.max_seconds:
+            raise BudgetExceeded()
+
+    def post_evaluate(self, config, population, species, best_genome):
+        self.generations += 1
+
+    def found_solution(self, config, generation, best):
+        self.solved_at = generation
+
+
+def expand_spec(spec):
+    """Gera a lista de combinações de parâmetros de um spec de grade ou aleatório.
+
+    {"grid": {"pop_size": [50, 150], ...}} -> produto cartesiano dos valores.
+    {"random": {"conn_add_prob": {"uniform": [0.1, 0.6]},
+                "pop_size": {"randint": [50, 300]},
+                "jump_threshold": {"choice": [0.2, 0.3]}}, "samples": 20}
+    """
+    if "grid" in spec:
+        names = list(spec["grid"])
+        return [dict(zip(names, values))
+                for values in itertools.product(*(spec["grid"][n] for n in names))]
+
+    rng = random.Random(spec.get("sample_seed", 0))
+    samplers = {
+        "uniform": lambda args: rng.uniform(*args),
+        "randint": lambda args: rng.randint(*args),
+        "choice": lambda args: rng.choice(args),
+    }
+    variants = []
+    for _ in range(spec.get("samples", 10)):
+        params = {}
+        for name, dist in spec["random"].items():
+            (kind, args), = dist.items()
+            params[name] = samplers[kind](args)
+        variants.append(params)
+    return variants
+
+
+def make_config(params, base_config=BASE_CONFIG):
+    """Aplica os parâmetros ao config base e devolve o texto do novo config.
+
+    Aceita "Seção.opção" ou só "opção"; neste caso todas as seções que têm essa
+    opção são alteradas.
+    """
+    parameters = ConfigParser()
+    parameters.read(base_config)
+    for name, value in params.items():
+        if name in GAME_PARAMS:
+            continue
+        if "." in name:
+            section, option = name.split(".", 1)
+            sections = [section]
+        else:
+            option = name
+            sections = [s for s in parameters.sections() if parameters.has_option(s, option)]
+        if not sections:
+            raise ValueError("Parâmetro {} não encontrado no config".format(name))
+        for section in sections:
+            parameters.set(section, option, str(value))
+
+    text = io.StringIO()
+    parameters.write(text)
+    return text.getvalue()
+
+
+def train_job(job):
+    # Executado em um processo do pool: treino headless com orçamento de gerações/tempo
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    result = {"job": job["job"], "seed": job["seed"], "solved": False, "generations": 0,
+              "wall_time": 0.0, "best_fitness": None, "champion_score": 0, "error": ""}
+    result.update(job["params"])
+
+    # A saída do jogo (um print por colisão) é descartada nos processos do pool
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        import flappy_ai
+        from fitness import FitnessPipeline
+        from speciation import NumpySpeciesSet
+
+        # Depois dos imports: o primeiro job de cada processo não paga o startup do pygame
+        start = time.time()
+
+        # neat.config.Config só lê de arquivo: o config gerado vive num temporário
+        with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as f:
+            f.write(job["config_text"])
+            config_path = f.name
+        try:
+            config = neat.config.Config(neat.DefaultGenome, neat.DefaultReproduction,
+                                        NumpySpeciesSet, neat.DefaultStagnation,
+                                        config_path)
+            flappy_ai.fitness_pipeline = FitnessPipeline.from_config(config_path)
+        except Exception as e:
+            result["error"] = repr(e)
+            return result
+        finally:
+            os.remove(config_path)
+
+        for name, attr in GAME_PARAMS.items():
+            if name in job["params"]:
+                setattr(flappy_ai, attr, job["params"][name])
+        flappy_ai.gen = 0
+        flappy_ai.curriculum = None
+
+        random.seed(job["seed"])
+        p = neat.Population(config)
+        budget = BudgetReporter(job["max_seconds"])
+        p.add_reporter(budget)
+        flappy_ai.episode_reporters.append(budget)
+        try:
+            p.run(flappy_ai.eval_genomes, job["max_generations"])
+        except BudgetExceeded:
+            pass
+        except Exception as e:
+            result["error"] = repr(e)
+        finally:
+            flappy_ai.episode_reporters.remove(budget)
+
+    result["solved"] = budget.solved_at is not None
+    result["generations"] = budget.solved_at + 1 if result["solved"] else budget.generations
+    result["wall_time"] = round(time.time() - start, 2)
+    if p.best_genome is not None:
+        result["best_fitness"] = round(p.best_genome.fitness, 2)
+    result["champion_score"] = budget.best_score
+    return result
+
+
+def run_sweep(spec, results_path="sweep_results.csv", workers=None, base_config=BASE_CONFIG):
+    variants = expand_spec(spec)
+    seeds = spec.get("seeds", [0])
+    jobs = []
+    for i, params in enumerate(variants):
+        config_text = make_config(params, base_config)
+        for seed in seeds:
+            jobs.append({"job": i, "seed": seed, "params": params, "config_text": config_text,
+                         "max_generations": spec.get("max_generations", 50),
+                         "max_seconds": spec.get("max_seconds")})
+    print(f"🔎 {len(variants)} configurações x {len(seeds)} seeds = {len(jobs)} treinos")
+
+    param_names = sorted({name for params in variants for name in params})
+    fields = ["job", "seed"] + param_names + ["solved", "generations", "wall_time",
+                                              "best_fitness", "champion_score", "error"]
+    results = []
+    with open(results_path, "w", newline="") as f, ProcessPoolExecutor(max_workers=workers) as pool:
+        writer = csv.DictWriter(f, fieldnames=fields)
+        writer.writeheader()
+        for future in as_completed(pool.submit(train_job, job) for job in jobs):
+            result = future.result()
+            writer.writerow(result)
+            f.flush()
+            results.append(result)
+            status = "✅" if result["solved"] else "⏱️"
+            print(f"{status} job {result['job']} seed {result['seed']}: "
+                  f"{result['generations']} gerações, {result['wall_time']}s, "
+                  f"score {result['champion_score']} {result['error']}")
+
+    # Mais rápidos primeiro: resolvidos, com menos gerações e menos tempo
+    results.sort(key=lambda r: (not r["solved"], r["generations"], r["wall_time"]))
+    print(f"\n🏆 Melhores configurações (resultados em {results_path}):")
+    for r in results[:5]:
+        params = ", ".join(f"{name}={r[name]}" for name in param_names if name in r)
+        print(f"  job {r['job']} seed {r['seed']}: {params} -> "
+              f"{r['generations']} gerações, {r['wall_time']}s, score {r['champion_score']}")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Busca de hiperparâmetros do Flappy Bird NEAT")
+    parser.add_argument("spec", help="arquivo JSON com a grade ou a busca aleatória")
+    parser.add_argument("-o", "--output", default="sweep_results.csv")
+    parser.add_argument("-w", "--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    with open(args.spec) as f:
+        spec = json.load(f)
+    run_sweep(spec, args.output, args.workers)
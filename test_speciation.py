@@ -0,0 +1,47 @@
+import os
+import random
+
+import neat
+import pytest
+
+from speciation import NumpySpeciesSet
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config-feedforward.txt")
+
+
+def fake_fitness(genomes, config):
+    # Fitness determinística (sem o jogo): depende só dos genes do genoma
+    for _, g in genomes:
+        g.fitness = sum(c.weight for c in g.connections.values()) + len(g.nodes)
+
+
+def partitions(species_set_type, pop_size, threshold, generations, seed):
+    config = neat.config.Config(neat.DefaultGenome, neat.DefaultReproduction,
+                                NumpySpeciesSet, neat.DefaultStagnation, CONFIG_PATH)
+    config.pop_size = pop_size
+    config.no_fitness_termination = True
+    config.species_set_config.compatibility_threshold = threshold
+    config.species_set_type = species_set_type
+
+    random.seed(seed)
+    p = neat.Population(config)
+    history = []
+
+    class Recorder(neat.reporting.BaseReporter):
+        def end_generation(self, config, population, species_set):
+            history.append(dict((sid, sorted(s.members)) for sid, s in species_set.species.items()))
+
+        def info(self, msg):
+            # Inclui a média/desvio das distâncias calculadas na especiação
+            history.append(msg)
+
+    p.add_reporter(Recorder())
+    p.run(fake_fitness, generations)
+    return history
+
+
+@pytest.mark.parametrize("pop_size, threshold", [(50, 3.0), (150, 1.0), (300, 3.0), (600, 1.5)])
+def test_same_partition_as_default(pop_size, threshold):
+    for seed in (0, 1):
+        expected = partitions(neat.DefaultSpeciesSet, pop_size, threshold, 15, seed)
+        assert partitions(NumpySpeciesSet, pop_size, threshold, 15, seed) == expected
@@ -0,0 +1,197 @@
+import numpy as np
+
+from assets import assets, PIPE
+from constants import JUMP_THRESHOLD
+from curriculum import Difficulty
+from fitness import FitnessPipeline, FrameState
+
+# Mesmas constantes do flappy_ai (posição inicial, física e limites da tela)
+FLOOR_Y = 550
+BIRD_X = 67
+BIRD_START_Y = 300
+GRAVITY = 0.17
+JUMP_VEL = -10.5
+PIPE_WIDTH = assets.size(PIPE)[0]
+MAX_FRAMES = 2000
+DEFAULT_DIFFICULTY = Difficulty(gap=200, vel=5, spawn_x=700)
+
+# Canos guardados por ambiente (o mais antigo primeiro)
+PIPE_SLOTS = 3
+
+
+class FlappyVectorEnv:
+    """N jogos simultâneos com o estado guardado em arrays NumPy.
+
+    reset(seeds) -> observações (N, 3)
+    step(actions) -> (observações, recompensas, done, info)
+
+    As observações são os mesmos inputs da rede no treinamento:
+    (vertical_diff, horizontal_dist, velocity). A recompensa de cada passo é a
+    fitness do frame (mesmos termos do FitnessPipeline do flappy_ai). Um jogo que
+    termina é reiniciado automaticamente; o score e os frames do jogo encerrado
+    ficam em info["score"] e info["frames"], e a observação devolvida já é a
+    do novo jogo.
+
+    Cada step corresponde a um frame do eval_genomes, começando logo depois da
+    decisão de pular: a sequência de estados é a mesma do treinamento.
+    """
+
+    def __init__(self, num_envs, difficulty=DEFAULT_DIFFICULTY, fitness_pipeline=None,
+                 max_frames=MAX_FRAMES):
+        self.num_envs = num_envs
+        self.difficulty = difficulty
+        self.fitness_pipeline = fitness_pipeline or FitnessPipeline()
+        self.max_frames = max_frames
+
+        n = num_envs
+        self.bird_y = np.zeros(n)
+        self.bird_vel = np.zeros(n)
+        self.tick = np.zeros(n, dtype=np.int64)
+        self.frames = np.zeros(n, dtype=np.int64)
+        self.score = np.zeros(n, dtype=np.int64)
+        self.pipe_x = np.zeros((n, PIPE_SLOTS))
+        self.pipe_h = np.zeros((n, PIPE_SLOTS))
+        self.pipe_passed = np.zeros((n, PIPE_SLOTS), dtype=bool)
+        self.n_pipes = np.zeros(n, dtype=np.int64)
+        self.rngs = [np.random.default_rng() for _ in range(n)]
+
+    def reset(self, seeds=None):
+        if seeds is None:
+            seeds = [None] * self.num_envs
+        self.rngs = [np.random.default_rng(seed) for seed in seeds]
+        self._reset_envs(np.arange(self.num_envs))
+        return self._begin_frame()
+
+    def step(self, actions):
+        n = self.num_envs
+        d = self.difficulty
+        all_envs = np.arange(n)
+
+        # Decisão do frame atual (pular reinicia a parábola do pássaro)
+        jump = np.asarray(actions, dtype=bool)
+        self.bird_vel[jump] = JUMP_VEL
+        self.tick[jump] = 0
+
+        # Fitness do frame, com o cano usado nas observações
+        rewards = np.zeros(n)
+        self.fitness_pipeline.step(rewards, all_envs, FrameState(
+            bird_x=np.full(n, float(BIRD_X)),
+            bird_y=self.bird_y,
+            pipe_x=self._pipe_x,
+            gap_center=self._gap_center))
+
+        # Canos: movimento, passagem e colisão
+        valid = np.arange(PIPE_SLOTS) < self.n_pipes[:, None]
+        self.pipe_x[valid] -= d.vel
+        passing = valid & ~self.pipe_passed & (BIRD_X >= self.pipe_x + PIPE_WIDTH - 10)
+        self.pipe_passed |= passing
+        add_pipe = passing.any(axis=1)
+        self.fitness_pipeline.award("pipe_passed", rewards, np.flatnonzero(add_pipe))
+
+        center_x = BIRD_X + 17
+        center_y = (self.bird_y + 12)[:, None]
+        in_pipe = valid & (center_x > self.pipe_x - 10) & (center_x < self.pipe_x + 60)
+        outside_gap = (center_y < self.pipe_h + 10) | (center_y > self.pipe_h + d.gap - 10)
+        dead = (in_pipe & outside_gap).any(axis=1)
+
+        # Novo cano quando o atual foi passado; remove os que saíram da tela
+        self.score += add_pipe
+        for i in np.flatnonzero(add_pipe):
+            self._spawn_pipe(i)
+        self._drop_pipes(valid & (self.pipe_x + PIPE_WIDTH < 0))
+
+        # Chão/teto e limite de frames
+        dead |= (self.bird_y + 30 >= FLOOR_Y) | (self.bird_y < -5)
+        done = dead | (self.frames >= self.max_frames)
+
+        info = {"score": self.score.copy(), "frames": self.frames.copy()}
+        finished = np.flatnonzero(done)
+        if len(finished):
+            self._reset_envs(finished)
+        return self._begin_frame(), rewards, done, info
+
+    def _reset_envs(self, envs):
+        self.bird_y[envs] = BIRD_START_Y
+        self.bird_vel[envs] = 0.0
+        self.tick[envs] = 0
+        self.frames[envs] = 0
+        self.score[envs] = 0
+        self.n_pipes[envs] = 0
+        self.pipe_passed[envs] = False
+        for i in envs:
+            self._spawn_pipe(i)
+
+    def _spawn_pipe(self, i):
+        slot = self.n_pipes[i]
+        # Com spawn_x muito perto do pássaro caberiam mais canos na tela do que há slots
+        assert slot < PIPE_SLOTS, "spawn_x={} deixa mais de {} canos na tela".format(
+            self.difficulty.spawn_x, PIPE_SLOTS)
+        self.pipe_x[i, slot] = self.difficulty.spawn_x
+        self.pipe_h[i, slot] = self.rngs[i].integers(50, 400)
+        self.pipe_passed[i, slot] = False
+        self.n_pipes[i] += 1
+
+    def _drop_pipes(self, removed):
+        count = removed.sum(axis=1)
+        if not count.any():
+            return
+        # Os removidos são sempre os mais antigos: desloca os restantes para o início
+        idx = np.minimum(np.arange(PIPE_SLOTS) + count[:, None], PIPE_SLOTS - 1)
+        self.pipe_x = np.take_along_axis(self.pipe_x, idx, axis=1)
+        self.pipe_h = np.take_along_axis(self.pipe_h, idx, axis=1)
+        self.pipe_passed = np.take_along_axis(self.pipe_passed, idx, axis=1)
+        self.n_pipes -= count
+
+    def _begin_frame(self):
+        # Início do frame: escolhe o cano, move o pássaro e calcula as observações
+        self.frames += 1
+        rows = np.arange(self.num_envs)
+        pipe_ind = ((self.n_pipes > 1) & (BIRD_X > self.pipe_x[:, 0] + PIPE_WIDTH)).astype(np.int64)
+        self._pipe_x = self.pipe_x[rows, pipe_ind]
+        self._gap_center = self.pipe_h[rows, pipe_ind] + self.difficulty.gap / 2
+
+        self.tick += 1
+        displacement = self.bird_vel * self.tick + 0.5 * GRAVITY * self.tick ** 2
+        displacement = np.where(displacement >= 16, 16, displacement)
+        displacement = np.where(displacement < 0, displacement - 2, displacement)
+        self.bird_y += displacement
+
+        return np.column_stack([
+            (self.bird_y - self._gap_center) / 100,
+            np.maximum(0, self._pipe_x - BIRD_X) / 400,
+            self.bird_vel / 10,
+        ])
+
+
+def evaluate(policy, episodes, num_envs=64, seed=0, **env_kwargs):
+    """Joga `episodes` partidas com `policy(obs) -> array de bool` e devolve os scores.
+
+    Serve para qualquer política: redes (net_policy), a PolicyTable
+    (table.decide_batch) ou uma regra escrita à mão.
+
+    Cada ambiente joga uma cota fixa de partidas e as que terminarem depois da
+    cota são descartadas: pegar as primeiras a terminar favoreceria os jogos curtos.
+    """
+    if episodes <= 0:
+        return []
+    num_envs = min(num_envs, episodes)
+    quota = np.full(num_envs, episodes // num_envs)
+    quota[:episodes % num_envs] += 1
+
+    env = FlappyVectorEnv(num_envs, **env_kwargs)
+    obs = env.reset(np.random.SeedSequence(seed).spawn(num_envs))
+    scores = [[] for _ in range(num_envs)]
+    remaining = quota.copy()
+    while remaining.any():
+        obs, _, done, info = env.step(policy(obs))
+        for i in np.flatnonzero(done & (remaining > 0)):
+            scores[i].append(int(info["score"][i]))
+            remaining[i] -= 1
+    return [score for env_scores in scores for score in env_scores]
+
+
+def net_policy(nets, threshold=JUMP_THRESHOLD):
+    # Uma rede por ambiente (ou a mesma rede repetida)
+    def policy(obs):
+        return np.array([net.activate(tuple(o))[0] > threshold for net, o in zip(nets, obs)])
+    return policy
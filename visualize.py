@@ -0,0 +1,284 @@
+import argparse
+import json
+import warnings
+from xml.sax.saxutils import escape
+
+from metrics import read_metrics
+
+# Nomes dos inputs/saída da rede do flappy_ai
+NODE_NAMES = {-1: "Vertical Diff", -2: "Horizontal Dist", -3: "Velocity", 0: "Jump"}
+
+
+def _pyplot():
+    # matplotlib só é importado quando um gráfico é realmente pedido
+    try:
+        import matplotlib.pyplot as plt
+    except ImportError:
+        warnings.warn("matplotlib não encontrado, gráficos desativados")
+        return None
+    return plt
+
+
+def plot_stats(metrics_file, ylog=False, view=False, filename="avg_fitness.svg"):
+    """Plota fitness médio (+/- 1 desvio) e melhor fitness a partir do CSV de métricas."""
+    plt = _pyplot()
+    if plt is None:
+        return
+
+    generation, best, avg, std = [], [], [], []
+    for row in read_metrics(metrics_file):
+        generation.append(row["generation"])
+        best.append(row["best_fitness"])
+        avg.append(row["mean_fitness"])
+        std.append(row["std_fitness"])
+
+    plt.plot(generation, avg, "b-", label="average")
+    plt.plot(generation, [a - s for a, s in zip(avg, std)], "g-.", label="-1 sd")
+    plt.plot(generation, [a + s for a, s in zip(avg, std)], "g-.", label="+1 sd")
+    plt.plot(generation, best, "r-", label="best")
+
+    plt.title("Population's average and best fitness")
+    plt.xlabel("Generations")
+    plt.ylabel("Fitness")
+    plt.grid()
+    plt.legend(loc="best")
+    if ylog:
+        plt.gca().set_yscale("symlog")
+
+    plt.savefig(filename)
+    if view:
+        plt.show()
+    plt.close()
+
+
+def plot_species(metrics_file, view=False, filename="speciation.svg"):
+    """Plota o número de espécies e o score por geração a partir do CSV de métricas."""
+    plt = _pyplot()
+    if plt is None:
+        return
+
+    generation, species, score = [], [], []
+    for row in read_metrics(metrics_file):
+        generation.append(row["generation"])
+        species.append(row["species"])
+        score.append(row["score"])
+
+    fig, ax = plt.subplots()
+    ax.plot(generation, species, "b-", label="species")
+    ax.set_xlabel("Generations")
+    ax.set_ylabel("Species")
+    ax2 = ax.twinx()
+    ax2.plot(generation, score, "r-", label="score")
+    ax2.set_ylabel("Score")
+
+    plt.title("Speciation")
+    fig.legend(loc="upper left")
+
+    plt.savefig(filename)
+    if view:
+        plt.show()
+    plt.close()
+
+
+def prune_topology(genome, config):
+    """Nós e conexões habilitadas que de fato influenciam as saídas."""
+    from neat.graphs import required_for_output
+
+    genome_config = config.genome_config
+    inputs = set(genome_config.input_keys)
+    outputs = set(genome_config.output_keys)
+    enabled = [key for key, conn in genome.connections.items() if conn.enabled]
+    required = required_for_output(inputs, outputs, enabled)
+
+    connections = [(i, o) for i, o in enabled if o in required and (i in required or i in inputs)]
+    used = outputs | {i for i, _ in connections} | {o for _, o in connections}
+    nodes = [k for k in sorted(inputs) if k in used] + sorted(used - inputs)
+    return nodes, connections
+
+
+def _layers(nodes, connections, inputs, outputs):
+    # Coluna de cada nó: inputs na primeira, saídas na última, ocultos pelo caminho mais longo
+    depth = dict((k, 0) for k in nodes)
+    for _ in nodes:
+        changed = False
+        for i, o in connections:
+            if depth[o] < depth[i] + 1:
+                depth[o] = depth[i] + 1
+                changed = True
+        if not changed:
+            break
+    last = max([depth[k] for k in nodes if k not in inputs] + [1])
+    for k in outputs:
+        depth[k] = last
+    return depth
+
+
+def topology_dict(genome, config, node_names=None):
+    node_names = node_names or NODE_NAMES
+    genome_config = config.genome_config
+    nodes, connections = prune_topology(genome, config)
+
+    node_list = []
+    for k in nodes:
+        if k in genome_config.input_keys:
+            node_list.append({"key": k, "type": "input", "name": node_names.get(k, str(k))})
+        else:
+            n = genome.nodes[k]
+            node_list.append({"key": k, "type": "output" if k in genome_config.output_keys else "hidden",
+                              "name": node_names.get(k, str(k)), "bias": n.bias,
+                              "response": n.response, "activation": n.activation,
+                              "aggregation": n.aggregation})
+    conn_list = [{"in": i, "out": o, "weight": genome.connections[i, o].weight}
+                 for i, o in connections]
+    return {"fitness": genome.fitness, "nodes": node_list, "connections": conn_list}
+
+
+def export_topology(genome, config, json_file="winner_topology.json", svg_file="winner_topology.svg",
+                    node_names=None):
+    """Grava a topologia podada do genoma em JSON e SVG, sem graphviz."""
+    topology = topology_dict(genome, config, node_names)
+    if json_file:
+        with open(json_file, "w") as f:
+            json.dump(topology, f, indent=2)
+    if svg_file:
+        with open(svg_file, "w") as f:
+            f.write(topology_svg(topology))
+    return topology
+
+
+def topology_svg(topology):
+    nodes = topology["nodes"]
+    inputs = {n["key"] for n in nodes if n["type"] == "input"}
+    outputs = {n["key"] for n in nodes if n["type"] == "output"}
+    edges = [(c["in"], c["out"]) for c in topology["connections"]]
+    depth = _layers([n["key"] for n in nodes], edges, inputs, outputs)
+
+    columns = {}
+    for n in nodes:
+        columns.setdefault(depth[n["key"]], []).append(n)
+    width = 160 * (max(columns) + 1) + 80
+    height = 70 * max(len(c) for c in columns.values()) + 40
+    pos = {}
+    for col, members in columns.items():
+        gap = height / (len(members) + 1)
+        for row, n in enumerate(members):
+            pos[n["key"]] = (80 + 160 * col, gap * (row + 1))
+
+    lines = ['<svg xmlns="http://www.w3.org/2000/svg" width="{:.0f}" height="{:.0f}" '
+             'font-family="sans-serif" font-size="10">'.format(width, height)]
+    for c in topology["connections"]:
+        (x1, y1), (x2, y2) = pos[c["in"]], pos[c["out"]]
+        color = "green" if c["weight"] > 0 else "red"
+        lines.append('<line x1="{:.1f}" y1="{:.1f}" x2="{:.1f}" y2="{:.1f}" stroke="{}" '
+                     'stroke-width="{:.2f}"><title>{:.3f}</title></line>'.format(
+                         x1, y1, x2, y2, color, 0.5 + abs(c["weight"]) / 2, c["weight"]))
+    fills = {"input": "lightgray", "output": "lightblue", "hidden": "white"}
+    for n in nodes:
+        x, y = pos[n["key"]]
+        lines.append('<circle cx="{:.1f}" cy="{:.1f}" r="14" fill="{}" stroke="black"/>'.format(
+            x, y, fills[n["type"]]))
+        lines.append('<text x="{:.1f}" y="{:.1f}" text-anchor="middle">{}</text>'.format(
+            x, y + 26, escape(n["name"])))
+    lines.append("</svg>")
+    return "\n".join(lines)
+
+
+def export_curves(metrics_file, json_file="fitness_curves.json", svg_file="fitness_curves.svg"):
+    """Grava as curvas de fitness e de espécies por geração em JSON e SVG, sem matplotlib."""
+    curves = {"generation": [], "best_fitness": [], "mean_fitness": [], "species": []}
+    for row in read_metrics(metrics_file):
+        for name in curves:
+            curves[name].append(row[name])
+    if json_file:
+        with open(json_file, "w") as f:
+            json.dump(curves, f)
+    if svg_file:
+        with open(svg_file, "w") as f:
+            f.write(curves_svg(curves))
+    return curves
+
+
+def curves_svg(curves, width=640, height=360, margin=40):
+    generations = curves["generation"]
+    lines = ['<svg xmlns="http://www.w3.org/2000/svg" width="{}" height="{}" '
+             'font-family="sans-serif" font-size="11">'.format(width, height),
+             '<rect x="{0}" y="{0}" width="{1}" height="{2}" fill="none" stroke="black"/>'.format(
+                 margin, width - 2 * margin, height - 2 * margin)]
+    if generations:
+        g0, g1 = generations[0], max(generations[-1], generations[0] + 1)
+        fitness_top = max(curves["best_fitness"] + curves["mean_fitness"] + [1])
+        species_top = max(curves["species"] + [1])
+
+        def polyline(values, top, color):
+            points = " ".join("{:.1f},{:.1f}".format(
+                margin + (g - g0) / (g1 - g0) * (width - 2 * margin),
+                height - margin - v / top * (height - 2 * margin)) for g, v in zip(generations, values))
+            return '<polyline points="{}" fill="none" stroke="{}"/>'.format(points, color)
+
+        lines.append(polyline(curves["best_fitness"], fitness_top, "red"))
+        lines.append(polyline(curves["mean_fitness"], fitness_top, "blue"))
+        lines.append(polyline(curves["species"], species_top, "green"))
+        lines.append('<text x="{}" y="{}">best (red), average (blue): 0 - {:.1f}</text>'.format(
+            margin, margin - 8, fitness_top))
+        lines.append('<text x="{}" y="{}" text-anchor="end">species (green): 0 - {}</text>'.format(
+            width - margin, margin - 8, species_top))
+        lines.append('<text x="{}" y="{}" text-anchor="middle">Generations {} - {}</text>'.format(
+            width / 2, height - margin / 3, g0, generations[-1]))
+    lines.append("</svg>")
+    return "\n".join(lines)
+
+
+def draw_net(topology, view=False, filename="winner_net", fmt="svg"):
+    """Renderiza a topologia (de topology_dict/JSON) com graphviz, se instalado."""
+    try:
+        import graphviz
+    except ImportError:
+        warnings.warn("graphviz não encontrado, use export_topology para o SVG simples")
+        return None
+
+    dot = graphviz.Digraph(format=fmt, node_attr={"shape": "circle", "fontsize": "9",
+                                                  "height": "0.2", "width": "0.2"})
+    names = {}
+    for n in topology["nodes"]:
+        names[n["key"]] = n["name"]
+        if n["type"] == "input":
+            dot.node(n["name"], _attributes={"style": "filled", "shape": "box", "fillcolor": "lightgray"})
+        elif n["type"] == "output":
+            dot.node(n["name"], _attributes={"style": "filled", "fillcolor": "lightblue"})
+        else:
+            dot.node(n["name"], _attributes={"style": "filled", "fillcolor": "white"})
+    for c in topology["connections"]:
+        dot.edge(names[c["in"]], names[c["out"]], _attributes={
+            "style": "solid", "color": "green" if c["weight"] > 0 else "red",
+            "penwidth": str(0.1 + abs(c["weight"] / 5.0))})
+    dot.render(filename, view=view)
+    return dot
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Gera os gráficos a partir dos arquivos do treino")
+    parser.add_argument("--metrics", default="metrics.csv")
+    parser.add_argument("--genome", default=None, help="genoma serializado (ex.: winner.pkl)")
+    parser.add_argument("--config", default="config-feedforward.txt")
+    parser.add_argument("--plot", action="store_true", help="também gera os gráficos com matplotlib")
+    parser.add_argument("--graphviz", action="store_true", help="também renderiza a rede com graphviz")
+    args = parser.parse_args()
+
+    export_curves(args.metrics)
+    if args.plot:
+        plot_stats(args.metrics)
+        plot_species(args.metrics)
+
+    if args.genome:
+        import pickle
+        import neat
+        from speciation import NumpySpeciesSet
+
+        config = neat.config.Config(neat.DefaultGenome, neat.DefaultReproduction,
+                                    NumpySpeciesSet, neat.DefaultStagnation,
+                                    args.config)
+        with open(args.genome, "rb") as f:
+            genome = pickle.load(f)
+        topology = export_topology(genome, config)
+        if args.graphviz:
+            draw_net(topology)